@@ -2,27 +2,178 @@ import numpy as np
 import sounddevice as sd
 import soundfile as sf
 from scipy import signal
+from numba import njit, types
 import threading
 import time
+from collections import namedtuple
+
+# Immutable snapshot of the user-controlled parameters. The pipeline thread
+# swaps in a new tuple on every change and the audio thread reads it once per
+# chunk; rebinding an attribute is atomic, so no lock is needed between them.
+AudioParams = namedtuple('AudioParams', ['bass', 'treble', 'speech', 'volume', 'echo', 'reverb'])
+
+
+@njit(cache=True, fastmath=True, inline='always')
+def _sos_sample(x, sos, zi):
+    """Run one sample through a cascade of transposed direct-form II biquads"""
+    for s in range(sos.shape[0]):
+        y = sos[s, 0] * x + zi[s, 0]
+        zi[s, 0] = sos[s, 1] * x - sos[s, 4] * y + zi[s, 1]
+        zi[s, 1] = sos[s, 2] * x - sos[s, 5] * y
+        x = y
+    return x
+
+
+@njit(cache=True, fastmath=True, inline='always')
+def _process_block(chunk, out, bass_sos, bass_zi, bass_gain,
+                   treble_sos, treble_zi, treble_gain,
+                   speech_sos, speech_zi, speech_gain,
+                   echo_buf, echo_pos, echo_decay, echo_on,
+                   reverb_buf, reverb_pos, reverb_delays, reverb_gains, reverb_on,
+                   volume):
+    """Apply EQ, echo, reverb, volume and clipping to a chunk in a single pass.
+    
+    Writes the result into the first column of out, shaped like the
+    (frames, channels) buffers sounddevice hands to the callback, and
+    returns the updated echo and reverb write positions.
+    """
+    use_bass = abs(bass_gain) > 0.01
+    use_treble = abs(treble_gain) > 0.01
+    use_speech = abs(speech_gain) > 0.01
+    
+    # Inactive bands restart from silence when they are switched back on
+    if not use_bass:
+        bass_zi[:] = 0.0
+    if not use_treble:
+        treble_zi[:] = 0.0
+    if not use_speech:
+        speech_zi[:] = 0.0
+    
+    echo_len = echo_buf.shape[0]
+    reverb_len = reverb_buf.shape[0]
+    
+    for n in range(chunk.shape[0]):
+        x = chunk[n]
+        if use_bass:
+            x = x + _sos_sample(x, bass_sos, bass_zi) * bass_gain
+        if use_treble:
+            x = x + _sos_sample(x, treble_sos, treble_zi) * treble_gain
+        if use_speech:
+            x = x + _sos_sample(x, speech_sos, speech_zi) * speech_gain
+        
+        # Echo: the slot about to be overwritten holds the sample one delay ago
+        delayed = echo_buf[echo_pos]
+        echo_buf[echo_pos] = x
+        echo_pos += 1
+        if echo_pos == echo_len:
+            echo_pos = 0
+        if echo_on:
+            x = x + delayed * echo_decay
+        
+        # Reverb: sum of taps read from a shared history before it is written
+        if reverb_on:
+            wet = x
+            for i in range(reverb_delays.shape[0]):
+                idx = reverb_pos - reverb_delays[i]
+                if idx < 0:
+                    idx += reverb_len
+                wet += reverb_buf[idx] * reverb_gains[i]
+        else:
+            wet = x
+        reverb_buf[reverb_pos] = x
+        reverb_pos += 1
+        if reverb_pos == reverb_len:
+            reverb_pos = 0
+        
+        # Hard-limit to full scale
+        y = wet * volume
+        if y > 1.0:
+            y = 1.0
+        elif y < -1.0:
+            y = -1.0
+        out[n, 0] = y
+    
+    return echo_pos, reverb_pos
+
+
+_f32 = types.float32
+_buf = types.float32[::1]
+_buf2d = types.float32[:, ::1]
+_KERNEL_SIGNATURE = types.UniTuple(types.int64, 2)(
+    types.float32[:], _buf2d,
+    _buf2d, _f32, _buf2d, _f32, _buf2d, _f32,
+    _buf, types.int64, _f32, types.boolean,
+    _buf, types.int64, types.int64[::1], _buf, types.boolean,
+    _f32)
+
+
+def _build_kernel(bass_sos, treble_sos, speech_sos):
+    """Compile _process_block with the filter coefficients frozen in.
+    
+    Numba treats closure arrays as compile-time constants, so inlining the
+    generic kernel here lets LLVM fold the coefficients into the biquad
+    loops. The explicit signature compiles eagerly, keeping the JIT out of
+    the audio thread.
+    """
+    @njit(_KERNEL_SIGNATURE, fastmath=True)
+    def kernel(chunk, out, bass_zi, bass_gain, treble_zi, treble_gain,
+               speech_zi, speech_gain,
+               echo_buf, echo_pos, echo_decay, echo_on,
+               reverb_buf, reverb_pos, reverb_delays, reverb_gains, reverb_on,
+               volume):
+        return _process_block(chunk, out, bass_sos, bass_zi, bass_gain,
+                              treble_sos, treble_zi, treble_gain,
+                              speech_sos, speech_zi, speech_gain,
+                              echo_buf, echo_pos, echo_decay, echo_on,
+                              reverb_buf, reverb_pos, reverb_delays, reverb_gains, reverb_on,
+                              volume)
+    
+    return kernel
+
 
 class AudioController:
     def __init__(self, audio_file):
         # Load audio file
-        self.audio_data, self.sample_rate = sf.read(audio_file)
+        self.audio_data, self.sample_rate = sf.read(audio_file, dtype='float32', always_2d=False)
         
         # Convert stereo to mono if needed
         if len(self.audio_data.shape) > 1:
             self.audio_data = np.mean(self.audio_data, axis=1)
         
-        # Audio parameters
-        self.bass_gain = 0.0
-        self.treble_gain = 0.0
-        self.speech_gain = 0.0
-        self.volume = 1.0
+        # Audio parameters and filter toggles
+        self._params = AudioParams(bass=0.0, treble=0.0, speech=0.0, volume=1.0,
+                                   echo=False, reverb=False)
+        
+        # EQ filters are designed once; zi carries filter state across chunks.
+        # Everything on the processing path is float32 to halve memory traffic.
+        # Filters run forward only, so bass and treble use 4th order (two
+        # biquads) to keep their slopes close to the old zero-phase filtfilt.
+        nyquist = self.sample_rate / 2
+        self.bass_sos = signal.butter(4, 250 / nyquist, btype='low',
+                                      output='sos').astype(np.float32)
+        self.treble_sos = signal.butter(4, 4000 / nyquist, btype='high',
+                                        output='sos').astype(np.float32)
+        self.speech_sos = signal.butter(2, [1000 / nyquist, 3000 / nyquist],
+                                        btype='band', output='sos').astype(np.float32)
+        self.bass_zi = np.zeros((self.bass_sos.shape[0], 2), dtype=np.float32)
+        self.treble_zi = np.zeros((self.treble_sos.shape[0], 2), dtype=np.float32)
+        self.speech_zi = np.zeros((self.speech_sos.shape[0], 2), dtype=np.float32)
+        
+        # Echo/reverb delay lines keep history across chunks of any size
+        echo_delay, self.echo_decay = 0.3, np.float32(0.5)
+        self.echo_buf = np.zeros(int(echo_delay * self.sample_rate), dtype=np.float32)
+        self.echo_pos = 0
+        
+        reverb_delays, reverb_decay = [0.029, 0.037, 0.041, 0.043], 0.3
+        self.reverb_delays = np.array([int(d * self.sample_rate) for d in reverb_delays],
+                                      dtype=np.int64)
+        self.reverb_gains = np.array([reverb_decay * (0.8 ** i) for i in range(len(reverb_delays))],
+                                     dtype=np.float32)
+        self.reverb_buf = np.zeros(self.reverb_delays.max(), dtype=np.float32)
+        self.reverb_pos = 0
         
-        # Filter states
-        self.echo_enabled = False
-        self.reverb_enabled = False
+        # Processing kernel specialized for this sample rate's filters
+        self.kernel = _build_kernel(self.bass_sos, self.treble_sos, self.speech_sos)
         
         # Adjustment step size
         self.step_size = 0.1
@@ -32,116 +183,102 @@ class AudioController:
         self.is_playing = False
         self.current_position = 0
         self.playback_thread = None
-        self.lock = threading.Lock()
         
-    def apply_eq(self, audio_chunk):
-        """Apply EQ adjustments (bass, treble, speech clarity)"""
-        # Design filters
-        nyquist = self.sample_rate / 2
+        # Single-producer/single-consumer ring of processed blocks. The
+        # playback thread only advances ring_write and the audio callback only
+        # advances ring_read, so neither side ever takes a lock.
+        self.block_size = 1024
+        self.ring = np.zeros((4, self.block_size, 1), dtype=np.float32)
+        self.ring_read = 0
+        self.ring_write = 0
+        self.chunk_buf = np.zeros(self.block_size, dtype=np.float32)
         
-        # Bass boost/cut (20-250 Hz)
-        if abs(self.bass_gain) > 0.01:
-            low_freq = 250 / nyquist
-            b_bass, a_bass = signal.butter(2, low_freq, btype='low')
-            bass = signal.filtfilt(b_bass, a_bass, audio_chunk)
-            audio_chunk = audio_chunk + bass * self.bass_gain
-        
-        # Treble boost/cut (4000+ Hz)
-        if abs(self.treble_gain) > 0.01:
-            high_freq = 4000 / nyquist
-            b_treble, a_treble = signal.butter(2, high_freq, btype='high')
-            treble = signal.filtfilt(b_treble, a_treble, audio_chunk)
-            audio_chunk = audio_chunk + treble * self.treble_gain
-        
-        # Speech clarity (1000-3000 Hz)
-        if abs(self.speech_gain) > 0.01:
-            low_speech = 1000 / nyquist
-            high_speech = 3000 / nyquist
-            b_speech, a_speech = signal.butter(2, [low_speech, high_speech], btype='band')
-            speech = signal.filtfilt(b_speech, a_speech, audio_chunk)
-            audio_chunk = audio_chunk + speech * self.speech_gain
-        
-        return audio_chunk
-    
-    def apply_echo(self, audio_chunk, delay=0.3, decay=0.5):
-        """Apply echo effect"""
-        delay_samples = int(delay * self.sample_rate)
-        output = np.copy(audio_chunk)
-        
-        if len(audio_chunk) > delay_samples:
-            output[delay_samples:] += audio_chunk[:-delay_samples] * decay
+    def process_audio(self, audio_chunk, out):
+        """Apply all active effects to audio chunk, writing into out (frames, 1)"""
+        # Read the parameter snapshot once; the kernel gets plain scalars
+        bass, treble, speech, volume, echo, reverb = self._params
+        f32 = np.float32
         
-        return output
+        # Apply EQ, echo, reverb, volume and clipping
+        self.echo_pos, self.reverb_pos = self.kernel(
+            audio_chunk, out,
+            self.bass_zi, f32(bass),
+            self.treble_zi, f32(treble),
+            self.speech_zi, f32(speech),
+            self.echo_buf, self.echo_pos, self.echo_decay, echo,
+            self.reverb_buf, self.reverb_pos, self.reverb_delays,
+            self.reverb_gains, reverb,
+            f32(volume))
     
-    def apply_reverb(self, audio_chunk, decay=0.3):
-        """Apply simple reverb effect"""
-        delays = [0.029, 0.037, 0.041, 0.043]
-        output = np.copy(audio_chunk)
+    def next_chunk(self, frames):
+        """Read the next frames of the song, looping at the end"""
+        start = self.current_position
+        end = start + frames
         
-        for i, delay in enumerate(delays):
-            delay_samples = int(delay * self.sample_rate)
-            if len(audio_chunk) > delay_samples:
-                output[delay_samples:] += audio_chunk[:-delay_samples] * decay * (0.8 ** i)
+        if end > len(self.audio_data):
+            # Loop audio: stitch the tail and head into the reusable buffer
+            split = len(self.audio_data) - start
+            chunk = self.chunk_buf[:frames]
+            np.copyto(chunk[:split], self.audio_data[start:])
+            np.copyto(chunk[split:], self.audio_data[:frames - split])
+            self.current_position = frames - split
+        else:
+            chunk = self.audio_data[start:end]
+            self.current_position = end
         
-        return output
+        return chunk
     
-    def process_audio(self, audio_chunk):
-        """Apply all active effects to audio chunk"""
-        with self.lock:
-            # Apply EQ
-            processed = self.apply_eq(audio_chunk)
-            
-            # Apply echo
-            if self.echo_enabled:
-                processed = self.apply_echo(processed)
-            
-            # Apply reverb
-            if self.reverb_enabled:
-                processed = self.apply_reverb(processed)
-            
-            # Apply volume
-            processed = processed * self.volume
-            
-            # Normalize to prevent clipping
-            max_val = np.max(np.abs(processed))
-            if max_val > 1.0:
-                processed = processed / max_val
+    def playback_loop(self):
+        """Keep the ring buffer filled with processed blocks"""
+        ring = self.ring
+        slots = len(ring)
+        block_size = self.block_size
+        next_chunk = self.next_chunk
+        process_audio = self.process_audio
+        wait = block_size / self.sample_rate / 4
+        
+        while self.is_playing:
+            write = self.ring_write
+            if write - self.ring_read >= slots:
+                time.sleep(wait)
+                continue
             
-            return processed
+            process_audio(next_chunk(block_size), ring[write % slots])
+            self.ring_write = write + 1
     
     def audio_callback(self, outdata, frames, time_info, status):
         """Callback for audio stream"""
-        with self.lock:
-            start = self.current_position
-            end = start + frames
-            
-            if end > len(self.audio_data):
-                # Loop audio
-                chunk = np.concatenate([
-                    self.audio_data[start:],
-                    self.audio_data[:end - len(self.audio_data)]
-                ])
-                self.current_position = end - len(self.audio_data)
-            else:
-                chunk = self.audio_data[start:end]
-                self.current_position = end
-            
-            # Process audio
-            processed = self.process_audio(chunk)
-            
-            # Output
-            outdata[:] = processed.reshape(-1, 1)
+        read = self.ring_read
+        if read < self.ring_write:
+            outdata[:] = self.ring[read % len(self.ring)]
+            self.ring_read = read + 1
+        else:
+            # Producer fell behind; play silence rather than wait for it
+            outdata.fill(0)
     
     def start_playback(self):
         """Start audio playback"""
         if not self.is_playing:
-            self.is_playing = True
+            # Open the device first so a failure leaves no producer running
             self.stream = sd.OutputStream(
                 samplerate=self.sample_rate,
+                blocksize=self.block_size,
                 channels=1,
+                dtype='float32',
                 callback=self.audio_callback
             )
-            self.stream.start()
+            self.is_playing = True
+            self.ring_read = 0
+            self.ring_write = 0
+            self.playback_thread = threading.Thread(target=self.playback_loop, daemon=True)
+            self.playback_thread.start()
+            try:
+                self.stream.start()
+            except Exception:
+                self.is_playing = False
+                self.playback_thread.join()
+                self.stream.close()
+                raise
     
     def stop_playback(self):
         """Stop audio playback"""
@@ -149,44 +286,49 @@ class AudioController:
             self.is_playing = False
             self.stream.stop()
             self.stream.close()
+            self.playback_thread.join()
     
     def handle_action(self, action):
         """Handle gesture action"""
-        with self.lock:
-            if action == "increase_bass":
-                self.bass_gain = min(2.0, self.bass_gain + self.step_size)
-            elif action == "decrease_bass":
-                self.bass_gain = max(-2.0, self.bass_gain - self.step_size)
-            
-            elif action == "increase_treble":
-                self.treble_gain = min(2.0, self.treble_gain + self.step_size)
-            elif action == "decrease_treble":
-                self.treble_gain = max(-2.0, self.treble_gain - self.step_size)
-            
-            elif action == "increase_volume":
-                self.volume = min(2.0, self.volume + self.volume_step)
-            elif action == "decrease_volume":
-                self.volume = max(0.0, self.volume - self.volume_step)
-            
-            elif action == "increase_speech":
-                self.speech_gain = min(2.0, self.speech_gain + self.step_size)
-            elif action == "decrease_speech":
-                self.speech_gain = max(-2.0, self.speech_gain - self.step_size)
-            
-            elif action == "toggle_echo":
-                self.echo_enabled = not self.echo_enabled
-            
-            elif action == "toggle_reverb":
-                self.reverb_enabled = not self.reverb_enabled
+        # Only the pipeline thread writes parameters, so read-modify-replace is safe
+        p = self._params
+        
+        if action == "increase_bass":
+            p = p._replace(bass=min(2.0, p.bass + self.step_size))
+        elif action == "decrease_bass":
+            p = p._replace(bass=max(-2.0, p.bass - self.step_size))
+        
+        elif action == "increase_treble":
+            p = p._replace(treble=min(2.0, p.treble + self.step_size))
+        elif action == "decrease_treble":
+            p = p._replace(treble=max(-2.0, p.treble - self.step_size))
+        
+        elif action == "increase_volume":
+            p = p._replace(volume=min(2.0, p.volume + self.volume_step))
+        elif action == "decrease_volume":
+            p = p._replace(volume=max(0.0, p.volume - self.volume_step))
+        
+        elif action == "increase_speech":
+            p = p._replace(speech=min(2.0, p.speech + self.step_size))
+        elif action == "decrease_speech":
+            p = p._replace(speech=max(-2.0, p.speech - self.step_size))
+        
+        elif action == "toggle_echo":
+            p = p._replace(echo=not p.echo)
+        
+        elif action == "toggle_reverb":
+            p = p._replace(reverb=not p.reverb)
+        
+        self._params = p
     
     def get_status(self):
         """Get current audio parameters"""
-        with self.lock:
-            return {
-                "bass": round(self.bass_gain, 2),
-                "treble": round(self.treble_gain, 2),
-                "speech": round(self.speech_gain, 2),
-                "volume": round(self.volume, 2),
-                "echo": "ON" if self.echo_enabled else "OFF",
-                "reverb": "ON" if self.reverb_enabled else "OFF"
-            }
+        p = self._params
+        return {
+            "bass": round(p.bass, 2),
+            "treble": round(p.treble, 2),
+            "speech": round(p.speech, 2),
+            "volume": round(p.volume, 2),
+            "echo": "ON" if p.echo else "OFF",
+            "reverb": "ON" if p.reverb else "OFF"
+        }
@@ -0,0 +1,387 @@
+"""
+Camera, gesture and audio pipeline shared by the mixer entry scripts
+"""
+
+import cv2
+import sys
+import os
+import time
+import threading
+from gesture_tracker import GestureTracker
+from audio_controller import AudioController
+from visualizers import JogwheelVisualizer, StatusHUD, draw_label, YELLOW
+
+# Console status refresh interval in seconds, independent of camera FPS
+STATUS_PRINT_INTERVAL = 0.3
+
+# Hand-tracking rate in Hz, independent of camera FPS. The gesture tracker
+# scales its thresholds by the time between detections, so sensitivity is
+# unaffected.
+INFERENCE_RATE = 15
+
+# Longest the display thread waits for a new frame before polling keys again
+DISPLAY_WAIT = 0.03
+
+# Longest shutdown waits for each pipeline thread before cleaning up anyway
+THREAD_JOIN_TIMEOUT = 2.0
+
+# Status shown when no audio is loaded; built once and never modified
+DEMO_STATUS = {
+    "bass": 0.0,
+    "treble": 0.0,
+    "speech": 0.0,
+    "volume": 1.0,
+    "echo": "OFF",
+    "reverb": "OFF"
+}
+
+# Audio parameter changed by each gesture action
+ACTION_TO_PARAM = {
+    f"{direction}_{param}": param
+    for param in ('bass', 'treble', 'speech', 'volume')
+    for direction in ('increase', 'decrease')
+}
+ACTION_TO_PARAM.update({'toggle_echo': 'echo', 'toggle_reverb': 'reverb'})
+
+
+class FrameGrabber(threading.Thread):
+    """Reads the webcam on its own thread and keeps only the newest frame.
+    
+    Every frame is grabbed to keep the driver queue drained, but only the
+    ones a reader is waiting for are decoded. When the reader takes longer
+    than a frame period between reads, every grab is decoded instead, so
+    the next read returns the newest frame without waiting for another.
+    That mode lasts until OVERRUN_HOLD reads in a row have kept up.
+    """
+    
+    # Reads in a row that must keep up before undecoded drops resume;
+    # long inference frames alternate with short ones, so one fast read
+    # says little
+    OVERRUN_HOLD = 30
+    
+    def __init__(self, cap):
+        super().__init__(daemon=True)
+        self.cap = cap
+        self.latest = None
+        self.lock = threading.Lock()
+        self.wanted = threading.Event()
+        self.new_frame = threading.Event()
+        self.stopped = threading.Event()
+        self.grabs_since_read = 0
+        self.decode_all = 0
+    
+    def run(self):
+        while not self.stopped.is_set():
+            if not self.cap.grab():
+                break
+            
+            # Frames grabbed while the reader is busy are dropped undecoded,
+            # unless the reader is overrunning and will want this one next
+            with self.lock:
+                self.grabs_since_read += 1
+                decode = self.decode_all > 0 or self.wanted.is_set()
+            if not decode:
+                continue
+            
+            ret, frame = self.cap.retrieve()
+            if not ret:
+                break
+            
+            with self.lock:
+                self.latest = frame
+                self.wanted.clear()
+                self.new_frame.set()
+        
+        # Wake a waiting reader so it sees the camera has stopped
+        self.stopped.set()
+        with self.lock:
+            self.new_frame.set()
+    
+    def read(self):
+        """Wait for a frame newer than the last one read, like cap.read()
+        
+        Returns (False, None) once the grabber has stopped and its last
+        frame has been read.
+        """
+        with self.lock:
+            # A grab since the last read returned means the caller took
+            # longer than a frame period
+            if self.grabs_since_read > 0:
+                self.decode_all = self.OVERRUN_HOLD
+            elif self.decode_all > 0:
+                self.decode_all -= 1
+            self.wanted.set()
+        self.new_frame.wait()
+        
+        with self.lock:
+            frame = self.latest
+            self.latest = None
+            self.grabs_since_read = 0
+            self.wanted.clear()
+            # After the grabber stops nothing sets the event again, so leave
+            # it set and let every later read return straight away
+            if not self.stopped.is_set():
+                self.new_frame.clear()
+        
+        return frame is not None, frame
+    
+    def stop(self, timeout=None):
+        """Stop grabbing and wait up to timeout seconds for the thread to exit"""
+        self.stopped.set()
+        with self.lock:
+            self.new_frame.set()
+        self.join(timeout)
+
+
+def pipeline_loop(grabber, gesture_tracker, audio_controller, jogwheel_viz, status_hud,
+                  output_slot, stop_event):
+    """Read frames, run gestures and audio, and publish annotated frames"""
+    last_status_print = 0.0
+    last_status_key = None
+    inference_period = 1.0 / INFERENCE_RATE
+    next_inference = 0.0
+    
+    try:
+        while not stop_event.is_set():
+            ret, frame = grabber.read()
+            
+            if not ret:
+                if not stop_event.is_set():
+                    print("\n⚠️  Failed to read frame from camera")
+                break
+            
+            # Hand tracking runs at INFERENCE_RATE; frames in between reuse
+            # the last landmarks so the display stays at camera rate. A
+            # quarter-period of slack keeps frames that arrive just before
+            # the deadline from slipping to the next one.
+            now = time.monotonic()
+            run_inference = now >= next_inference - inference_period / 4
+            
+            # Flip frame for mirror effect. With OpenCL the flip runs on the
+            # GPU, detection reuses the uploaded image, and a single download
+            # gives the host copy that overlays are drawn on.
+            if run_inference and cv2.ocl.useOpenCL():
+                gpu_frame = cv2.flip(cv2.UMat(frame), 1)
+                frame = gpu_frame.get()
+            else:
+                frame = cv2.flip(frame, 1)
+                gpu_frame = frame
+            
+            # Process frame and detect gestures
+            try:
+                if run_inference:
+                    actions = gesture_tracker.detect(gpu_frame)
+                    # Advance on a fixed schedule rather than from now, and
+                    # resync if processing has fallen behind
+                    next_inference = max(next_inference + inference_period, now)
+                else:
+                    actions = []
+                processed_frame = gesture_tracker.draw(frame)
+            except Exception as e:
+                print(f"\n⚠️  Gesture tracking error: {e}")
+                processed_frame = frame
+                actions = []
+            
+            # Handle detected actions, then read the resulting status once
+            if audio_controller:
+                for action in actions:
+                    audio_controller.handle_action(action)
+                status = audio_controller.get_status()
+                
+                # Update jogwheel for each parameter that changed
+                for action in actions:
+                    param = ACTION_TO_PARAM.get(action)
+                    if param:
+                        jogwheel_viz.update(param, status[param])
+            else:
+                status = DEMO_STATUS
+            
+            # Draw jogwheels on frame
+            processed_frame = jogwheel_viz.draw(processed_frame)
+            
+            # Display status on frame (moved to right side to avoid jogwheel overlap)
+            status_hud.draw(processed_frame, status)
+            
+            # Add frame counter and mode indicator
+            mode_text = "DEMO MODE" if not audio_controller else "LIVE AUDIO"
+            draw_label(processed_frame, mode_text, (10, processed_frame.shape[0] - 10),
+                       YELLOW, 0.5, 1)
+            
+            # Print status to console at a fixed cadence to reduce flicker,
+            # and only when a value has changed since the last print
+            if audio_controller and now - last_status_print >= STATUS_PRINT_INTERVAL:
+                status_key = tuple(status.values())
+                if status_key != last_status_key:
+                    print_status(status)
+                    last_status_key = status_key
+                last_status_print = now
+            
+            # Hand the frame to the display thread, replacing any unshown one
+            with output_slot["lock"]:
+                output_slot["frame"] = processed_frame
+                output_slot["ready"].set()
+    
+    except Exception as e:
+        print(f"\n\n❌ Unexpected error: {e}")
+        import traceback
+        traceback.print_exc()
+    
+    finally:
+        stop_event.set()
+
+
+def poll_key():
+    """Read a pending key press without blocking, where OpenCV supports it"""
+    if hasattr(cv2, "pollKey"):
+        return cv2.pollKey()
+    return cv2.waitKey(1)
+
+def print_status(status):
+    """Print current audio status to console"""
+    line = (f"Bass: {status['bass']:+.1f} | Treble: {status['treble']:+.1f} | "
+            f"Speech: {status['speech']:+.1f} | Volume: {status['volume']:.2f} | "
+            f"Echo: {status['echo']} | Reverb: {status['reverb']}")
+    # Pad instead of pre-blanking so the line goes out in a single write
+    print(f"\r{line:<100}", end="", flush=True)
+
+def run(audio_file, visualizer=None, hud=None):
+    """Run the mixer until the user quits.
+    
+    visualizer and hud default to a JogwheelVisualizer and a StatusHUD.
+    """
+    print("=" * 80)
+    print("GESTURE-CONTROLLED AUDIO MIXER")
+    print("=" * 80)
+    
+    # Check if audio file exists
+    if not os.path.exists(audio_file):
+        print(f"⚠️  Audio file '{audio_file}' not found!")
+        print("💡 Running in DEMO MODE (no audio playback)")
+        print("   Update the AUDIO_FILE path in main.py to enable audio")
+        audio_controller = None
+    else:
+        print(f"✓ Loading audio: {audio_file}")
+        try:
+            audio_controller = AudioController(audio_file)
+            audio_controller.start_playback()
+            print("✓ Audio playback started!")
+        except Exception as e:
+            print(f"⚠️  Audio error: {e}")
+            print("💡 Running in DEMO MODE (video only)")
+            audio_controller = None
+    
+    # Let OpenCV offload image preprocessing to the GPU where available
+    cv2.ocl.setUseOpenCL(cv2.ocl.haveOpenCL())
+    if cv2.ocl.useOpenCL():
+        print("✓ OpenCL acceleration enabled")
+    
+    # Initialize gesture tracker
+    print("✓ Initializing gesture tracker...")
+    try:
+        gesture_tracker = GestureTracker(model_complexity=0, detection_rate=INFERENCE_RATE)
+    except Exception as e:
+        print(f"❌ Error initializing gesture tracker: {e}")
+        if audio_controller:
+            audio_controller.stop_playback()
+        sys.exit(1)
+    
+    # Initialize overlays
+    jogwheel_viz = visualizer if visualizer is not None else JogwheelVisualizer()
+    status_hud = hud if hud is not None else StatusHUD()
+    print("✓ Jogwheel visualizer ready!")
+    
+    # Open webcam
+    print("✓ Opening webcam...")
+    cap = cv2.VideoCapture(0)
+    
+    if not cap.isOpened():
+        print("❌ Error: Could not open webcam!")
+        if audio_controller:
+            audio_controller.stop_playback()
+        gesture_tracker.release()
+        sys.exit(1)
+    
+    # Set camera properties for better performance. MJPG must be requested
+    # before the resolution, otherwise many drivers fall back to raw YUY2.
+    cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
+    cap.set(cv2.CAP_PROP_FPS, 30)
+    
+    # Keep only the newest frame in the driver queue to cut input latency
+    if not cap.set(cv2.CAP_PROP_BUFFERSIZE, 1):
+        print("⚠️  Could not shrink capture buffer; gestures may lag")
+    
+    grabber = FrameGrabber(cap)
+    grabber.start()
+    
+    print("✓ Webcam ready!")
+    print("\n" + "=" * 80)
+    print("GESTURE CONTROLS:")
+    print("=" * 80)
+    print("LEFT HAND:  ↑=Bass+  ↓=Bass-  →=Treble+  ←=Treble-  Rotate=Echo Toggle")
+    print("RIGHT HAND: ↑=Vol+   ↓=Vol-   →=Speech+  ←=Speech-  Rotate=Reverb Toggle")
+    print("=" * 80)
+    print("\n🎥 Camera window should appear now...")
+    print("📌 Press 'q' to quit\n")
+    
+    # Create window
+    window_name = 'Gesture-Controlled Audio Mixer'
+    cv2.namedWindow(window_name, cv2.WINDOW_NORMAL)
+    
+    # The capture/gesture/audio pipeline runs on a worker thread and hands
+    # finished frames to this thread, which only displays them
+    stop_event = threading.Event()
+    output_slot = {"frame": None, "lock": threading.Lock(), "ready": threading.Event()}
+    worker = threading.Thread(
+        target=pipeline_loop,
+        args=(grabber, gesture_tracker, audio_controller, jogwheel_viz, status_hud,
+              output_slot, stop_event),
+        daemon=True
+    )
+    worker.start()
+    
+    try:
+        while not stop_event.is_set():
+            # Sleep until the worker hands over a frame instead of inside
+            # waitKey, so a finished frame is shown as soon as it is ready
+            output_slot["ready"].wait(DISPLAY_WAIT)
+            with output_slot["lock"]:
+                frame = output_slot["frame"]
+                output_slot["frame"] = None
+                output_slot["ready"].clear()
+            
+            # Show frame
+            if frame is not None:
+                cv2.imshow(window_name, frame)
+            
+            # Check for quit; this also services the window's GUI events
+            key = poll_key() & 0xFF
+            if key == ord('q'):
+                print("\n\n👋 Quit command received")
+                break
+    
+    except KeyboardInterrupt:
+        print("\n\n⚠️  Interrupted by user")
+    
+    finally:
+        # Cleanup; stopping the grabber also unblocks the worker's read
+        print("\n🧹 Cleaning up...")
+        stop_event.set()
+        grabber.stop(timeout=THREAD_JOIN_TIMEOUT)
+        worker.join(timeout=THREAD_JOIN_TIMEOUT)
+        if audio_controller:
+            audio_controller.stop_playback()
+        
+        # Threads still running are daemons and die with the process;
+        # releasing what they are using from here would be unsafe
+        if worker.is_alive():
+            print("⚠️  Pipeline did not stop in time; skipping tracker release")
+        else:
+            gesture_tracker.release()
+        if grabber.is_alive():
+            print("⚠️  Camera did not stop in time; skipping camera release")
+        else:
+            cap.release()
+        cv2.destroyAllWindows()
+        print("✅ Done!")
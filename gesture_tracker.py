@@ -2,79 +2,166 @@ import cv2
 import mediapipe as mp
 import numpy as np
 import math
-from collections import deque
+import time
+from enum import IntEnum
+
+# Hand label text style
+FONT = cv2.FONT_HERSHEY_SIMPLEX
+GREEN = (0, 255, 0)
+
+class GestureCode(IntEnum):
+    """Hand gestures, used to index the per-hand action and cooldown tables"""
+    UP = 0
+    DOWN = 1
+    RIGHT = 2
+    LEFT = 3
+    ROTATE_CW = 4
+    ROTATE_CCW = 5
+
+# Audio action triggered by each gesture, for the left and right hand
+GESTURE_ACTIONS = (
+    ("increase_bass", "decrease_bass", "increase_treble", "decrease_treble",
+     "toggle_echo", "toggle_echo"),
+    ("increase_volume", "decrease_volume", "increase_speech", "decrease_speech",
+     "toggle_reverb", "toggle_reverb"),
+)
+
+class PositionHistory:
+    """Fixed-size window of recent positions with a running sum"""
+    
+    def __init__(self, size=5):
+        # Plain floats: scalar NumPy indexing costs more than the math here
+        self.samples = [(0.0, 0.0)] * size
+        self.sx = 0.0
+        self.sy = 0.0
+        self.index = 0
+        self.count = 0
+    
+    def __len__(self):
+        return self.count
+    
+    def add(self, position):
+        """Record a position and return the mean of the window"""
+        x, y = position
+        old_x, old_y = self.samples[self.index]
+        self.sx += x - old_x
+        self.sy += y - old_y
+        self.samples[self.index] = (x, y)
+        self.index = (self.index + 1) % len(self.samples)
+        if self.count < len(self.samples):
+            self.count += 1
+        return (self.sx / self.count, self.sy / self.count)
+    
+    def previous(self):
+        """Return the sample recorded before the latest one"""
+        if self.count < 2:
+            return None
+        return self.samples[(self.index - 2) % len(self.samples)]
 
 class GestureTracker:
-    def __init__(self):
+    def __init__(self, static_image_mode=False, model_complexity=0, max_num_hands=2,
+                 min_detection_confidence=0.5, min_tracking_confidence=0.5,
+                 detection_rate=30):
+        # In tracking mode the palm detector only reruns when tracking is lost
         self.mp_hands = mp.solutions.hands
         self.hands = self.mp_hands.Hands(
-            static_image_mode=False,
-            max_num_hands=2,
-            min_detection_confidence=0.5,
-            min_tracking_confidence=0.5
+            static_image_mode=static_image_mode,
+            model_complexity=model_complexity,
+            max_num_hands=max_num_hands,
+            min_detection_confidence=min_detection_confidence,
+            min_tracking_confidence=min_tracking_confidence
         )
         self.mp_draw = mp.solutions.drawing_utils
         self.frame_count = 0
         
+        # Resolution fed to MediaPipe; landmarks are normalized so they
+        # still map straight onto the full-size frame
+        self.process_size = (320, 240)
+        width, height = self.process_size
+        self.small_buf = np.empty((height, width, 3), dtype=np.uint8)
+        self.rgb_buf = np.empty((height, width, 3), dtype=np.uint8)
+        
+        # Hands found by the last detect() call, as (label, landmarks)
+        self.last_hands = []
+        
+        # Gesture thresholds are set per second and converted to per-call
+        # values from the measured time between detect() calls, so the hand
+        # speed needed to trigger a gesture does not depend on the call rate.
+        # detection_rate is the expected rate, used to size the smoothing
+        # window and for the very first call.
+        self.detection_rate = detection_rate
+        self.last_detect_ns = None
+        self.motion_speed = 0.6  # Normalized units per second
+        self.rotation_speed = 450  # Degrees per second
+        self.smoothing_window = 1 / 6  # Seconds
+        
         # Motion history for smoothing
-        self.left_hand_history = deque(maxlen=5)
-        self.right_hand_history = deque(maxlen=5)
+        history_size = max(2, int(self.smoothing_window * detection_rate + 0.5))
+        self.left_hand_history = PositionHistory(history_size)
+        self.right_hand_history = PositionHistory(history_size)
         
         # Rotation tracking
-        self.left_hand_angle = None
-        self.right_hand_angle = None
-        self.rotation_threshold = 15
+        self.left_hand_vector = None
+        self.right_hand_vector = None
+        self.rotation_threshold = 0.0
+        self.rotation_threshold_sin_sq = 0.0
         
-        # Gesture cooldown
-        self.last_gesture_time = {}
-        self.cooldown = 0.3
+        # Gesture cooldown (monotonic nanoseconds), indexed [hand][gesture]
+        self.cooldown_ns = 300_000_000
+        self.last_gesture_time = [[-self.cooldown_ns] * len(GestureCode) for _ in range(2)]
         
         # Motion thresholds
-        self.motion_threshold = 0.02
+        self.motion_threshold = 0.0
+        
+        self.scale_thresholds(1 / detection_rate)
+    
+    def scale_thresholds(self, period):
+        """Set the per-call thresholds for a detect() interval in seconds"""
+        self.motion_threshold = self.motion_speed * period
         
-    def get_hand_angle(self, landmarks):
-        """Calculate angle between wrist and index finger base"""
+        # Past 90 degrees the sine falls again, so cap the angle there; the
+        # dot product test in detect_rotation covers larger turns
+        self.rotation_threshold = min(90.0, self.rotation_speed * period)
+        self.rotation_threshold_sin_sq = math.sin(math.radians(self.rotation_threshold)) ** 2
+    
+    def get_hand_vector(self, landmarks):
+        """Get the vector from wrist to index finger base"""
         wrist = landmarks[0]
         index_base = landmarks[5]
         
-        dx = index_base.x - wrist.x
-        dy = index_base.y - wrist.y
-        
-        angle = math.degrees(math.atan2(dy, dx))
-        return angle
+        return (index_base.x - wrist.x, index_base.y - wrist.y)
     
-    def detect_rotation(self, current_angle, previous_angle, hand_label):
+    def detect_rotation(self, current_vec, previous_vec):
         """Detect significant rotation change"""
-        if previous_angle is None:
+        if previous_vec is None:
             return None
         
-        angle_diff = current_angle - previous_angle
+        px, py = previous_vec
+        cx, cy = current_vec
         
-        # Normalize angle difference to -180 to 180
-        while angle_diff > 180:
-            angle_diff -= 360
-        while angle_diff < -180:
-            angle_diff += 360
+        # sin and cos of the turn, scaled by both vector lengths
+        cross = px * cy - py * cx
+        dot = px * cx + py * cy
         
-        if abs(angle_diff) > self.rotation_threshold:
-            if angle_diff > 0:
-                return f"rotate_{hand_label}_cw"
+        # Past 90 degrees the dot product goes negative; below that compare
+        # |sin| against the threshold without taking a square root
+        norm_sq = (px * px + py * py) * (cx * cx + cy * cy)
+        if dot < 0 or cross * cross > self.rotation_threshold_sin_sq * norm_sq:
+            if cross >= 0:
+                return GestureCode.ROTATE_CW
             else:
-                return f"rotate_{hand_label}_ccw"
+                return GestureCode.ROTATE_CCW
         
         return None
     
     def smooth_position(self, position, history):
         """Apply moving average to reduce jitter"""
-        history.append(position)
+        mean = history.add(position)
         if len(history) < 2:
             return position
-        
-        avg_x = sum(p[0] for p in history) / len(history)
-        avg_y = sum(p[1] for p in history) / len(history)
-        return (avg_x, avg_y)
+        return mean
     
-    def detect_motion(self, current_pos, previous_pos, hand_label):
+    def detect_motion(self, current_pos, previous_pos):
         """Detect directional motion"""
         if previous_pos is None:
             return None
@@ -87,122 +174,121 @@ class GestureTracker:
         # Vertical motion
         if abs(dy) > self.motion_threshold:
             if dy < 0:  # Moving up (y decreases)
-                gestures.append(f"increase_{hand_label}_up")
+                gestures.append(GestureCode.UP)
             else:  # Moving down
-                gestures.append(f"decrease_{hand_label}_down")
+                gestures.append(GestureCode.DOWN)
         
         # Horizontal motion
         if abs(dx) > self.motion_threshold:
             if dx > 0:  # Moving right
-                gestures.append(f"increase_{hand_label}_right")
+                gestures.append(GestureCode.RIGHT)
             else:  # Moving left
-                gestures.append(f"decrease_{hand_label}_left")
+                gestures.append(GestureCode.LEFT)
         
         return gestures if gestures else None
     
-    def map_gesture_to_action(self, gesture, hand_label):
-        """Map detected gesture to audio action"""
-        actions = []
-        
-        if hand_label == "left":
-            if "up" in gesture:
-                actions.append("increase_bass")
-            elif "down" in gesture:
-                actions.append("decrease_bass")
-            elif "right" in gesture:
-                actions.append("increase_treble")
-            elif "left" in gesture:
-                actions.append("decrease_treble")
-        
-        elif hand_label == "right":
-            if "up" in gesture:
-                actions.append("increase_volume")
-            elif "down" in gesture:
-                actions.append("decrease_volume")
-            elif "right" in gesture:
-                actions.append("increase_speech")
-            elif "left" in gesture:
-                actions.append("decrease_speech")
+    def detect(self, frame):
+        """Detect gestures in a frame (ndarray or UMat) without drawing on it"""
+        self.frame_count += 1
+        now = time.monotonic_ns()
         
-        return actions
-    
-    def process_frame(self, frame):
-        """Process a frame and detect gestures"""
-        import time
+        if self.last_detect_ns is not None:
+            self.scale_thresholds((now - self.last_detect_ns) / 1e9)
+        self.last_detect_ns = now
         
-        self.frame_count += 1
+        # Downsample, then convert BGR to RGB for MediaPipe. With OpenCL
+        # enabled both steps run on the GPU and only the small image comes back.
+        # Callers that already hold the frame as a UMat can pass it directly.
+        if cv2.ocl.useOpenCL() and not isinstance(frame, cv2.UMat):
+            frame = cv2.UMat(frame)
+        if isinstance(frame, cv2.UMat):
+            small = cv2.resize(frame, self.process_size, interpolation=cv2.INTER_AREA)
+            frame_rgb = cv2.cvtColor(small, cv2.COLOR_BGR2RGB).get()
+        else:
+            # CPU path writes into reused buffers instead of allocating
+            cv2.resize(frame, self.process_size, dst=self.small_buf,
+                       interpolation=cv2.INTER_AREA)
+            self.rgb_buf.flags.writeable = True
+            cv2.cvtColor(self.small_buf, cv2.COLOR_BGR2RGB, dst=self.rgb_buf)
+            frame_rgb = self.rgb_buf
         
-        # Convert BGR to RGB for MediaPipe
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        # A read-only image lets MediaPipe use it without copying
+        frame_rgb.flags.writeable = False
         
         # Process with MediaPipe
         results = self.hands.process(frame_rgb)
         
         actions = []
+        self.last_hands = []
         
         if results.multi_hand_landmarks and results.multi_handedness:
             for hand_landmarks, handedness in zip(results.multi_hand_landmarks, results.multi_handedness):
-                # Draw landmarks
-                self.mp_draw.draw_landmarks(
-                    frame, hand_landmarks, self.mp_hands.HAND_CONNECTIONS
-                )
-                
                 # Get hand label
                 hand_label = handedness.classification[0].label.lower()
+                self.last_hands.append((hand_label, hand_landmarks))
                 
                 # Get wrist position
                 wrist = hand_landmarks.landmark[0]
                 current_pos = (wrist.x, wrist.y)
                 
+                # Left hand uses row 0 of the action/cooldown tables, right row 1
+                hand = 0 if hand_label == "left" else 1
+                hand_actions = GESTURE_ACTIONS[hand]
+                last_time = self.last_gesture_time[hand]
+                
                 # Smooth position
                 if hand_label == "left":
                     smoothed_pos = self.smooth_position(current_pos, self.left_hand_history)
-                    previous_pos = self.left_hand_history[-2] if len(self.left_hand_history) >= 2 else None
+                    previous_pos = self.left_hand_history.previous()
                 else:
                     smoothed_pos = self.smooth_position(current_pos, self.right_hand_history)
-                    previous_pos = self.right_hand_history[-2] if len(self.right_hand_history) >= 2 else None
+                    previous_pos = self.right_hand_history.previous()
                 
                 # Detect motion
-                motion_gestures = self.detect_motion(smoothed_pos, previous_pos, hand_label)
+                motion_gestures = self.detect_motion(smoothed_pos, previous_pos)
                 
                 if motion_gestures:
                     for gesture in motion_gestures:
-                        current_time = time.time()
-                        if gesture not in self.last_gesture_time or \
-                           current_time - self.last_gesture_time[gesture] > self.cooldown:
-                            actions.extend(self.map_gesture_to_action(gesture, hand_label))
-                            self.last_gesture_time[gesture] = current_time
+                        if now - last_time[gesture] > self.cooldown_ns:
+                            actions.append(hand_actions[gesture])
+                            last_time[gesture] = now
                 
                 # Detect rotation
-                current_angle = self.get_hand_angle(hand_landmarks.landmark)
+                current_vec = self.get_hand_vector(hand_landmarks.landmark)
                 
                 if hand_label == "left":
-                    rotation = self.detect_rotation(current_angle, self.left_hand_angle, hand_label)
-                    self.left_hand_angle = current_angle
-                    
-                    if rotation:
-                        current_time = time.time()
-                        if rotation not in self.last_gesture_time or \
-                           current_time - self.last_gesture_time[rotation] > self.cooldown:
-                            actions.append("toggle_echo")
-                            self.last_gesture_time[rotation] = current_time
+                    rotation = self.detect_rotation(current_vec, self.left_hand_vector)
+                    self.left_hand_vector = current_vec
                 else:
-                    rotation = self.detect_rotation(current_angle, self.right_hand_angle, hand_label)
-                    self.right_hand_angle = current_angle
-                    
-                    if rotation:
-                        current_time = time.time()
-                        if rotation not in self.last_gesture_time or \
-                           current_time - self.last_gesture_time[rotation] > self.cooldown:
-                            actions.append("toggle_reverb")
-                            self.last_gesture_time[rotation] = current_time
+                    rotation = self.detect_rotation(current_vec, self.right_hand_vector)
+                    self.right_hand_vector = current_vec
                 
-                # Display hand label
-                cv2.putText(frame, f"{hand_label.upper()}", 
-                           (int(wrist.x * frame.shape[1]), int(wrist.y * frame.shape[0]) - 20),
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+                if rotation is not None and now - last_time[rotation] > self.cooldown_ns:
+                    actions.append(hand_actions[rotation])
+                    last_time[rotation] = now
+        
+        return actions
+    
+    def draw(self, frame):
+        """Draw the most recently detected hands onto a frame of any size"""
+        for hand_label, hand_landmarks in self.last_hands:
+            # Draw landmarks
+            self.mp_draw.draw_landmarks(
+                frame, hand_landmarks, self.mp_hands.HAND_CONNECTIONS
+            )
+            
+            # Display hand label
+            wrist = hand_landmarks.landmark[0]
+            cv2.putText(frame, f"{hand_label.upper()}",
+                        (int(wrist.x * frame.shape[1]), int(wrist.y * frame.shape[0]) - 20),
+                        FONT, 0.7, GREEN, 2)
         
-        return frame, actions
+        return frame
+    
+    def process_frame(self, frame):
+        """Process a frame and detect gestures"""
+        actions = self.detect(frame)
+        return self.draw(frame), actions
     
     def release(self):
         """Release resources"""
@@ -0,0 +1,272 @@
+"""
+Overlays drawn on the camera frame: parameter jogwheels and the status HUD
+"""
+
+import cv2
+import math
+import numpy as np
+
+# Jogwheel configuration
+JOGWHEEL_RADIUS = 60
+JOGWHEEL_ALPHA = 0.15  # Very low opacity for high transparency - can see hands clearly
+JOGWHEEL_FADE_FRAMES = 30  # How long jogwheel stays visible after gesture
+
+# Unit vectors for the 12 jogwheel tick marks (every 30°)
+TICK_ANGLES = np.arange(12) * (np.pi / 6)
+TICK_COS, TICK_SIN = np.cos(TICK_ANGLES), np.sin(TICK_ANGLES)
+
+# Text rendering
+FONT = cv2.FONT_HERSHEY_SIMPLEX
+GREEN = (0, 255, 0)
+YELLOW = (0, 255, 255)
+WHITE = (255, 255, 255)
+
+def draw_label(img, text, xy, color, scale=0.6, thickness=2):
+    """Draw text in the overlay font"""
+    cv2.putText(img, text, xy, FONT, scale, color, thickness)
+
+
+class JogwheelVisualizer:
+    """Handles jogwheel visualization for audio parameters"""
+    
+    # Background colour of tile images; any pixel left at this value is
+    # transparent when the tile is pasted onto a frame
+    TILE_KEY_COLOR = (255, 0, 255)
+    
+    def __init__(self):
+        self.active_wheels = {}  # {parameter_name: {'value': float, 'frames_left': int, 'position': (x, y)}}
+        self.positions = {
+            'bass': (120, 120),
+            'treble': (120, 250),
+            'speech': (520, 120),
+            'volume': (520, 250),
+            'echo': (320, 120),
+            'reverb': (320, 250)
+        }
+        
+        # The rings, ticks and label never change, so render them once
+        self.tiles = {}
+        for param, position in self.positions.items():
+            self.tiles[param, position] = self._render_tile(position, param)
+    
+    def update(self, parameter, value):
+        """Update or activate a jogwheel for a parameter"""
+        self.active_wheels[parameter] = {
+            'value': value,
+            'frames_left': JOGWHEEL_FADE_FRAMES,
+            'position': self.positions.get(parameter, (320, 240))
+        }
+    
+    def draw(self, frame):
+        """Draw all active jogwheels on the frame"""
+        # Update fade counters
+        to_remove = []
+        for param, data in self.active_wheels.items():
+            # Decrease fade counter
+            data['frames_left'] -= 1
+            if data['frames_left'] <= 0:
+                to_remove.append(param)
+        
+        # Remove expired wheels
+        for param in to_remove:
+            del self.active_wheels[param]
+        
+        if not self.active_wheels:
+            return frame
+        
+        # Draw each active wheel into a copy of its own tile-sized region
+        # and blend just that region back
+        for param, data in self.active_wheels.items():
+            x0, y0, image, _ = self._get_tile(param, data['position'])
+            region = frame[y0:y0 + image.shape[0], x0:x0 + image.shape[1]]
+            
+            # Frames too small to reach this wheel's tile have nothing to blend
+            if region.size == 0:
+                continue
+            
+            overlay = region.copy()
+            self._draw_jogwheel(overlay, (x0, y0), data['position'], data['value'], param)
+            cv2.addWeighted(overlay, JOGWHEEL_ALPHA, region, 1 - JOGWHEEL_ALPHA, 0, region)
+        
+        return frame
+    
+    def _get_tile(self, parameter, position):
+        """Return the static tile for a wheel, rendering it if needed"""
+        tile = self.tiles.get((parameter, position))
+        if tile is None:
+            tile = self.tiles[parameter, position] = self._render_tile(position, parameter)
+        return tile
+    
+    def _render_tile(self, position, parameter):
+        """Render the static parts of a jogwheel into a keyed tile.
+        
+        Returns (x0, y0, image, mask) where (x0, y0) is the tile's top-left
+        corner in frame coordinates.
+        """
+        cx, cy = position
+        radius = JOGWHEEL_RADIUS
+        x0, y0 = cx - radius - 50, cy - radius - 5
+        image = np.empty((2 * radius + 45, 2 * radius + 100, 3), dtype=np.uint8)
+        image[:] = self.TILE_KEY_COLOR
+        
+        # Draw in tile coordinates
+        cx, cy = cx - x0, cy - y0
+        
+        # Draw outer circle
+        cv2.circle(image, (cx, cy), radius, (100, 100, 100), 2)
+        cv2.circle(image, (cx, cy), radius - 5, (60, 60, 60), 1)
+        
+        # Draw center circle
+        cv2.circle(image, (cx, cy), 8, (200, 200, 200), -1)
+        
+        # Draw tick marks
+        x1 = (cx + (radius - 10) * TICK_COS).astype(np.int32)
+        y1 = (cy + (radius - 10) * TICK_SIN).astype(np.int32)
+        x2 = (cx + (radius - 3) * TICK_COS).astype(np.int32)
+        y2 = (cy + (radius - 3) * TICK_SIN).astype(np.int32)
+        for a, b, c, d in zip(x1.tolist(), y1.tolist(), x2.tolist(), y2.tolist()):
+            cv2.line(image, (a, b), (c, d), (150, 150, 150), 1)
+        
+        # Draw parameter label BELOW jogwheel
+        padding = 5
+        label = parameter.upper()
+        label_size = cv2.getTextSize(label, FONT, 0.6, 2)[0]
+        label_x = cx - label_size[0] // 2
+        label_y = cy + radius + 25
+        
+        # Draw background for label
+        cv2.rectangle(image,
+                     (label_x - padding, label_y - label_size[1] - padding),
+                     (label_x + label_size[0] + padding, label_y + padding),
+                     (0, 0, 0), -1)
+        
+        draw_label(image, label, (label_x, label_y), WHITE)
+        
+        mask = np.any(image != self.TILE_KEY_COLOR, axis=2, keepdims=True)
+        return x0, y0, image, mask
+    
+    def _draw_jogwheel(self, frame, origin, position, value, parameter):
+        """Draw a single jogwheel onto a canvas whose top-left is origin in frame coordinates"""
+        cx, cy = position[0] - origin[0], position[1] - origin[1]
+        radius = JOGWHEEL_RADIUS
+        
+        # Paste the pre-rendered rings, ticks and label
+        x0, y0, image, mask = self._get_tile(parameter, position)
+        x0, y0 = x0 - origin[0], y0 - origin[1]
+        roi = frame[y0:y0 + image.shape[0], x0:x0 + image.shape[1]]
+        h, w = roi.shape[:2]
+        np.copyto(roi, image[:h, :w], where=mask[:h, :w])
+        
+        # Calculate needle angle based on value
+        # Map value range to -135° to +135° (270° total range)
+        if parameter in ['bass', 'treble', 'speech']:
+            # Range -12 to +12
+            angle_deg = (value / 12.0) * 135
+        elif parameter == 'volume':
+            # Range 0 to 2
+            angle_deg = ((value - 1.0) / 1.0) * 135
+        elif parameter in ['echo', 'reverb']:
+            # Binary: OFF = -90°, ON = +90°
+            angle_deg = 90 if value == "ON" else -90
+        else:
+            angle_deg = 0
+        
+        # Draw needle
+        # Scalar math functions avoid NumPy's per-call ufunc overhead here
+        angle_rad = math.radians(angle_deg - 90)  # -90 to start from top
+        needle_length = radius - 15
+        needle_x = int(cx + needle_length * math.cos(angle_rad))
+        needle_y = int(cy + needle_length * math.sin(angle_rad))
+        
+        # Draw needle with gradient effect
+        cv2.line(frame, (cx, cy), (needle_x, needle_y), YELLOW, 3)
+        cv2.circle(frame, (needle_x, needle_y), 4, (0, 200, 255), -1)
+        
+        # Draw value text in CENTER of jogwheel
+        if parameter in ['bass', 'treble', 'speech']:
+            value_text = f"{value:+.1f}"
+        elif parameter == 'volume':
+            value_text = f"{value:.2f}"
+        else:
+            value_text = str(value)
+        
+        value_size = cv2.getTextSize(value_text, FONT, 0.7, 2)[0]
+        value_x = cx - value_size[0] // 2
+        value_y = cy + value_size[1] // 2
+        
+        # Draw background for value text for better readability
+        padding = 5
+        cv2.rectangle(frame, 
+                     (value_x - padding, value_y - value_size[1] - padding),
+                     (value_x + value_size[0] + padding, value_y + padding),
+                     (0, 0, 0), -1)
+        
+        draw_label(frame, value_text, (value_x, value_y), YELLOW, 0.7)
+
+
+class StatusHUD:
+    """Renders the status text once and reuses it until the status changes"""
+    
+    def __init__(self):
+        self.width = 205
+        self.height = 190
+        self.panel = np.zeros((self.height, self.width, 3), dtype=np.uint8)
+        # 255 minus each pixel's text coverage; OpenCV 5 antialiases text,
+        # so edge pixels are only partly covered
+        self.inv_alpha = np.full((self.height, self.width, 1), 255, dtype=np.uint16)
+        self.key = None
+        
+        # Tight bounds of the rendered text within the panel
+        self.rows = slice(0, 0)
+        self.cols = slice(0, 0)
+    
+    def _render(self, status):
+        """Rasterize the status lines into the cached panel"""
+        self.panel[:] = 0
+        lines = [
+            (f"Bass: {status['bass']:+.1f}", GREEN),
+            (f"Treble: {status['treble']:+.1f}", GREEN),
+            (f"Speech: {status['speech']:+.1f}", GREEN),
+            (f"Volume: {status['volume']:.2f}", GREEN),
+            (f"Echo: {status['echo']}", YELLOW),
+            (f"Reverb: {status['reverb']}", YELLOW),
+        ]
+        # Text starts 5px into the panel so thick strokes are not clipped
+        y_offset = 30
+        for text, color in lines:
+            draw_label(self.panel, text, (5, y_offset), color)
+            y_offset += 30
+        # Every text colour has a channel at 255, so the brightest channel
+        # of the panel, drawn on black, is the coverage
+        coverage = self.panel.max(axis=2, keepdims=True)
+        np.subtract(255, coverage, out=self.inv_alpha)
+        
+        # Blend only the rows and columns that contain text
+        ys = np.flatnonzero(coverage.any(axis=(1, 2)))
+        xs = np.flatnonzero(coverage.any(axis=(0, 2)))
+        self.rows = slice(ys[0], ys[-1] + 1)
+        self.cols = slice(xs[0], xs[-1] + 1)
+    
+    def draw(self, frame, status):
+        """Blend the cached panel onto the frame by its text coverage"""
+        # Re-render only when a value changes at the precision shown
+        key = (round(status['bass'], 1), round(status['treble'], 1),
+               round(status['speech'], 1), round(status['volume'], 2),
+               status['echo'], status['reverb'])
+        if key != self.key:
+            self._render(status)
+            self.key = key
+        
+        # The panel is right-aligned; clip its text bounds to the frame so
+        # frames smaller than the panel only get the part that fits
+        x0 = frame.shape[1] - self.width
+        rows = slice(self.rows.start, min(self.rows.stop, frame.shape[0]))
+        cols = slice(max(self.cols.start, -x0), self.cols.stop)
+        if rows.start >= rows.stop or cols.start >= cols.stop:
+            return frame
+        
+        # The panel holds colour already scaled by coverage, so only the
+        # background needs weighting; fully covered pixels are copied exactly
+        target = frame[rows, x0 + cols.start:x0 + cols.stop]
+        target[:] = (target * self.inv_alpha[rows, cols] + 127) // 255 + self.panel[rows, cols]
+        return frame